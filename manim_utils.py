@@ -1,6 +1,25 @@
 from manim import *
+from manim import constants as manim_constants
+from manim.animation.animation import prepare_animation
+from manim.renderer import cairo_renderer
+from manim.utils import hashing
+from pygments.lexers import get_lexer_by_name, guess_lexer, guess_lexer_for_filename
+from pygments.styles import get_style_by_name
+import av
+import copyreg
+import hashlib
+import html
+import inspect
+import pickle
 import random
-from collections import defaultdict
+import sys
+import textwrap
+import zlib
+from collections import OrderedDict, defaultdict, deque
+from contextlib import contextmanager
+from enum import Enum
+from pathlib import Path
+from time import perf_counter
 
 
 
@@ -156,33 +175,1920 @@ class LinkedList(VGroup):
         
         return Transform(pointer_group[0], new_arrow), Transform(pointer_group[1], new_text)
 
+class TreeNode(VGroup):
+    """
+    A Mobject representing a single node in a binary tree
+    It's a VGroup containing the circle and the value_text
+    """
+    def __init__(self, value, node_color=BLUE, radius=0.5, **kwargs):
+        super().__init__(**kwargs)
+        self.value = value
+
+        self.circle = Circle(radius=radius, color=node_color, fill_opacity=0.5)
+        self.value_text = Text(str(value), color=WHITE, font_size=32).move_to(self.circle.get_center())
+
+        # keep long values inside the circle
+        if self.value_text.width > radius * 1.4:
+            self.value_text.scale_to_fit_width(radius * 1.4)
+
+        self.add(self.circle, self.value_text)
+
+class _TreeEntry:
+    """
+    The logical side of a tree node: links, layout cache and its mobjects.
+    Kept separate from TreeNode so copying a mobject never copies the tree.
+    """
+    def __init__(self, value, mob):
+        self.value = value
+        self.mob = mob
+        self.edge = None # Line from the parent to this node
+        self.left = None
+        self.right = None
+        self.parent = None
+        self.height = 1 # used by AVLTree
+
+        # layout cache (see BinaryTree._update_layout)
+        self.dirty = True   # contour / child offsets need recomputing
+        self.placed = False # absolute position needs recomputing
+        self.offset = 0.0   # x offset relative to the parent
+        self.left_contour = [0.0]  # min x per depth, relative to this node
+        self.right_contour = [0.0] # max x per depth, relative to this node
+        self.pos = None     # last (x, depth) in layout space
+
+    def children(self):
+        return [child for child in (self.left, self.right) if child is not None]
+
+class BinaryTree(VGroup):
+    """
+    Base Mobject for binary trees (BST, AVLTree, BinaryHeap).
+
+    Layout is a Reingold-Tilford style tidy tree that is updated
+    incrementally: every entry caches its subtree contours, and an insert,
+    delete or rotation only marks the path up to the root dirty. Only those
+    entries are recomputed, and only nodes whose position actually changed
+    are animated.
+    """
+    ANCHOR_LENGTH = 0.01
+
+    def __init__(self, node_color=BLUE, node_radius=0.5, sibling_gap=1.4,
+                 level_height=1.5, edge_color=WHITE, **kwargs):
+        super().__init__(**kwargs)
+        self.node_color = node_color
+        self.node_radius = node_radius
+        self.sibling_gap = sibling_gap
+        self.level_height = level_height
+        self.edge_color = edge_color
+        self.root = None
+
+        # An invisible reference line: its start is where the root goes and
+        # its length tracks any scaling applied to the whole tree.
+        self.anchor = Line(ORIGIN, RIGHT * self.ANCHOR_LENGTH, stroke_opacity=0)
+        self.edges_group = VGroup()
+        self.nodes_group = VGroup()
+
+        self.pointers = {}        # label -> VGroup(arrow, text)
+        self.pointer_targets = {} # label -> [entry, direction, offset]
+        self._relinked = {}       # entries whose parent changed since the last layout (ordered)
+        self._discarded = []      # faded-out mobjects to drop on the next change
+
+        # edges first so the nodes are drawn on top of them
+        self.add(self.anchor, self.edges_group, self.nodes_group)
+
+    ### Lookup ###
+
+    def entries(self):
+        """All entries in level order."""
+        queue = [self.root] if self.root is not None else []
+        for entry in queue:
+            queue.extend(entry.children())
+        return queue
+
+    def find_entry(self, value):
+        for entry in self.entries():
+            if entry.value == value:
+                return entry
+        return None
+
+    def get_node(self, value):
+        entry = self.find_entry(value)
+        return entry.mob if entry is not None else None
+
+    ### Structure helpers ###
+
+    def _frame(self):
+        """Current (origin, unit) of the layout in scene coordinates."""
+        start, end = self.anchor.get_start(), self.anchor.get_end()
+        return start, np.linalg.norm(end - start) / self.ANCHOR_LENGTH
+
+    def _to_point(self, pos):
+        origin, unit = self._frame()
+        x, depth = pos
+        return origin + unit * np.array([x, -depth * self.level_height, 0])
+
+    def _new_entry(self, value):
+        _, unit = self._frame()
+        mob = TreeNode(value, node_color=self.node_color, radius=self.node_radius).scale(unit)
+        self.nodes_group.add(mob)
+        return _TreeEntry(value, mob)
+
+    def _mark_dirty(self, entry):
+        # ancestors of a dirty entry are always dirty, so we can stop early
+        while entry is not None and not entry.dirty:
+            entry.dirty = True
+            entry.placed = False
+            entry = entry.parent
+
+    def _set_child(self, parent, side, child):
+        """Links child as parent.left / parent.right (parent None = root)."""
+        if parent is None:
+            self.root = child
+        else:
+            setattr(parent, side, child)
+            self._mark_dirty(parent)
+        if child is not None:
+            child.parent = parent
+            self._relinked[child] = None
+
+    def _side_of(self, entry):
+        if entry.parent is None:
+            return None
+        return "left" if entry.parent.left is entry else "right"
+
+    def _replace(self, old, new):
+        """Puts `new` where `old` hangs in the tree."""
+        self._set_child(old.parent, self._side_of(old), new)
+
+    def _rotate_left(self, entry):
+        pivot = entry.right
+        self._replace(entry, pivot)
+        self._set_child(entry, "right", pivot.left)
+        self._set_child(pivot, "left", entry)
+        return pivot
+
+    def _rotate_right(self, entry):
+        pivot = entry.left
+        self._replace(entry, pivot)
+        self._set_child(entry, "left", pivot.right)
+        self._set_child(pivot, "right", entry)
+        return pivot
+
+    @staticmethod
+    def _fade_out_in_place(mob):
+        """
+        Fades `mob` out wherever it is when the animation starts. Unlike
+        mob.animate, ApplyMethod builds its target in begin(), so earlier
+        steps of a Succession (swaps, relayouts) are respected; unlike
+        FadeOut it doesn't remove the mobject from the scene.
+        """
+        return ApplyMethod(mob.set_opacity, 0)
+
+    def _discard(self, entry):
+        """Detaches a removed entry's mobjects and returns their fade-outs."""
+        self._relinked.pop(entry, None)
+        anims = []
+        for mob in (entry.mob, entry.edge):
+            if mob is not None:
+                anims.append(self._fade_out_in_place(mob))
+                self._discarded.append(mob)
+        for label, target in self.pointer_targets.items():
+            if target[0] is entry:
+                anims.append(self._fade_out_in_place(self.pointers[label]))
+        return anims
+
+    def _flush_discarded(self):
+        """Drops mobjects faded out by an earlier (already played) change."""
+        for mob in self._discarded:
+            self.nodes_group.remove(mob)
+            self.edges_group.remove(mob)
+        self._discarded = []
+
+    ### Incremental layout ###
+
+    def _layout_entry(self, entry):
+        """Recomputes one entry's child offsets and contours from its children."""
+        left, right = entry.left, entry.right
+        if left is not None and right is not None:
+            # closest the two subtrees may get at any shared depth
+            sep = max(l - r for l, r in zip(left.right_contour, right.left_contour))
+            sep += self.sibling_gap
+            left.offset, right.offset = -sep / 2, sep / 2
+        elif left is not None:
+            left.offset = -self.sibling_gap / 2
+        elif right is not None:
+            right.offset = self.sibling_gap / 2
+
+        left_contour, right_contour = [0.0], [0.0]
+        children = entry.children()
+        depth = max((len(child.left_contour) for child in children), default=0)
+        for d in range(depth):
+            level = [child for child in children if d < len(child.left_contour)]
+            left_contour.append(min(child.left_contour[d] + child.offset for child in level))
+            right_contour.append(max(child.right_contour[d] + child.offset for child in level))
+        entry.left_contour, entry.right_contour = left_contour, right_contour
+        entry.dirty = False
+
+    def _update_layout(self):
+        """Post-order pass over the dirty part of the tree only."""
+        stack = [(self.root, False)]
+        while stack:
+            entry, children_done = stack.pop()
+            if entry is None or not entry.dirty:
+                continue
+            if children_done:
+                self._layout_entry(entry)
+            else:
+                stack.append((entry, True))
+                stack.append((entry.left, False))
+                stack.append((entry.right, False))
+
+    def _place(self):
+        """
+        Assigns absolute layout positions top-down and returns the entries
+        that moved. A clean subtree whose root kept its position is skipped
+        entirely, since nothing inside it can have moved.
+        """
+        moved = []
+        stack = [(self.root, 0.0, 0)] if self.root is not None else []
+        while stack:
+            entry, x, depth = stack.pop()
+            if entry.placed and entry.pos == (x, depth):
+                continue
+            if entry.pos != (x, depth):
+                moved.append(entry)
+            entry.pos = (x, depth)
+            entry.placed = True
+            for child in entry.children():
+                stack.append((child, x + child.offset, depth + 1))
+        return moved
+
+    def _make_edge(self, parent, child):
+        _, unit = self._frame()
+        return Line(
+            self._to_point(parent.pos),
+            self._to_point(child.pos),
+            buff=self.node_radius * unit,
+            color=self.edge_color
+        )
+
+    def _make_pointer(self, label, entry, direction=UP, offset=1.0, p_color=PINK):
+        _, unit = self._frame()
+        tip = self._to_point(entry.pos) + direction * self.node_radius * unit
+        arrow = Arrow(tip + direction * offset, tip, buff=0.1, color=p_color)
+        text = Text(label, color=p_color, font_size=24).next_to(arrow, direction, buff=0.1)
+        return VGroup(arrow, text)
+
+    def _relayout(self, new_entries=(), animate=True):
+        """
+        Updates the layout after a structural change and returns an
+        animation that only touches nodes, edges and pointers that moved.
+        """
+        self._update_layout()
+        moved = self._place()
+        anims = []
+
+        for entry in moved:
+            target = self._to_point(entry.pos)
+            if entry in new_entries or not animate:
+                entry.mob.move_to(target)
+            else:
+                anims.append(entry.mob.animate.move_to(target))
+        for entry in new_entries:
+            if animate:
+                anims.append(FadeIn(entry.mob))
+
+        # edges whose ends moved or whose parent changed (dicts keep the
+        # order deterministic, so the scene hashes the same on every run)
+        affected = dict.fromkeys(moved)
+        affected.update(self._relinked)
+        affected.update(dict.fromkeys(child for entry in moved for child in entry.children()))
+        for entry in affected:
+            if entry.parent is None:
+                if entry.edge is not None: # became the root
+                    if animate:
+                        anims.append(self._fade_out_in_place(entry.edge))
+                        self._discarded.append(entry.edge)
+                    else:
+                        self.edges_group.remove(entry.edge)
+                    entry.edge = None
+                continue
+            new_edge = self._make_edge(entry.parent, entry)
+            if entry.edge is None:
+                entry.edge = new_edge
+                self.edges_group.add(new_edge)
+                if animate:
+                    anims.append(Create(new_edge))
+            elif animate:
+                anims.append(Transform(entry.edge, new_edge))
+            else:
+                entry.edge.become(new_edge)
+        self._relinked = {}
+
+        # pointers follow the node they point at
+        moved_entries = dict.fromkeys(moved)
+        for label, (entry, direction, offset) in self.pointer_targets.items():
+            if entry in moved_entries:
+                pointer_group = self.pointers[label]
+                new_pointer = self._make_pointer(label, entry, direction, offset, pointer_group[0].get_color())
+                anims.append(Transform(pointer_group, new_pointer))
+
+        if not anims:
+            return Wait(0.1)
+        return AnimationGroup(*anims)
+
+    ### Public API ###
+
+    def rotate_left(self, value):
+        """Rotates the subtree at `value` left and returns the animation."""
+        entry = self.find_entry(value)
+        if entry is None or entry.right is None:
+            print(f"Error: Cannot rotate left at '{value}'.")
+            return FadeIn(Square().set_opacity(0))
+        self._flush_discarded()
+        self._rotate_left(entry)
+        return self._relayout()
+
+    def rotate_right(self, value):
+        """Rotates the subtree at `value` right and returns the animation."""
+        entry = self.find_entry(value)
+        if entry is None or entry.left is None:
+            print(f"Error: Cannot rotate right at '{value}'.")
+            return FadeIn(Square().set_opacity(0))
+        self._flush_discarded()
+        self._rotate_right(entry)
+        return self._relayout()
+
+    def create_pointer(self, value, label="ptr", p_color=PINK, direction=UP, offset=1.0):
+        """Creates a pointer to the node holding `value` and returns its FadeIn."""
+        entry = self.find_entry(value)
+        if entry is None:
+            print(f"Error: Value '{value}' not found.")
+            return FadeIn(Square().set_opacity(0))
+
+        pointer_group = self._make_pointer(label, entry, direction, offset, p_color)
+        self.pointers[label] = pointer_group
+        self.pointer_targets[label] = [entry, direction, offset]
+        self.add(pointer_group)
+        return FadeIn(pointer_group)
+
+    def transfer_pointer(self, label, value, direction=UP, offset=1.0):
+        """Moves a stored pointer to the node holding `value`."""
+        if label not in self.pointers:
+            print(f"Error: Pointer '{label}' not found.")
+            return FadeIn(Square().set_opacity(0))
+
+        entry = self.find_entry(value)
+        if entry is None:
+            print(f"Error: Value '{value}' not found.")
+            return FadeIn(Square().set_opacity(0))
+
+        pointer_group = self.pointers[label]
+        new_pointer = self._make_pointer(label, entry, direction, offset, pointer_group[0].get_color())
+        self.pointer_targets[label] = [entry, direction, offset]
+        return Transform(pointer_group, new_pointer)
+
+class BST(BinaryTree):
+    """
+    A binary search tree Mobject. insert() and delete() return
+    animations that only move the nodes whose position changed.
+    """
+    def __init__(self, values=(), **kwargs):
+        super().__init__(**kwargs)
+        new_entries = [self._insert_entry(value) for value in values]
+        self._relayout(new_entries, animate=False)
+
+    def find_entry(self, value):
+        entry = self.root
+        while entry is not None and entry.value != value:
+            entry = entry.left if value < entry.value else entry.right
+        return entry
+
+    def search_path(self, value):
+        """Entries visited while searching for `value`."""
+        path = []
+        entry = self.root
+        while entry is not None:
+            path.append(entry)
+            if entry.value == value:
+                break
+            entry = entry.left if value < entry.value else entry.right
+        return path
+
+    def search(self, value):
+        """Returns an animation flashing each node on the search path."""
+        path = self.search_path(value)
+        if not path:
+            return Wait(0.1)
+        return Succession(*[Indicate(entry.mob) for entry in path])
+
+    def _insert_entry(self, value):
+        entry = self._new_entry(value)
+        parent, side = None, None
+        current = self.root
+        while current is not None:
+            parent = current
+            side = "left" if value < current.value else "right"
+            current = getattr(current, side)
+        self._set_child(parent, side, entry)
+        return entry
+
+    def _delete_entry(self, entry):
+        """
+        Unlinks `entry` and returns the deepest entry whose subtree changed
+        (where rebalancing has to start).
+        """
+        if entry.left is not None and entry.right is not None:
+            # the in-order successor takes the deleted node's place
+            successor = entry.right
+            while successor.left is not None:
+                successor = successor.left
+            lowest = successor.parent if successor.parent is not entry else successor
+            if successor.parent is not entry:
+                self._replace(successor, successor.right)
+                self._set_child(successor, "right", entry.right)
+            self._replace(entry, successor)
+            self._set_child(successor, "left", entry.left)
+            return lowest
+
+        child = entry.left if entry.left is not None else entry.right
+        self._replace(entry, child)
+        return entry.parent
+
+    def insert(self, value):
+        """Inserts `value` and returns the animation."""
+        self._flush_discarded()
+        entry = self._insert_entry(value)
+        return self._relayout([entry])
+
+    def delete(self, value):
+        """Deletes `value` and returns the animation."""
+        entry = self.find_entry(value)
+        if entry is None:
+            print(f"Error: Value '{value}' not found.")
+            return FadeIn(Square().set_opacity(0))
+
+        self._flush_discarded()
+        self._delete_entry(entry)
+        fade_outs = self._discard(entry)
+        return AnimationGroup(*fade_outs, self._relayout())
+
+class AVLTree(BST):
+    """
+    A self-balancing BST. When an insert or delete needs rotations the
+    returned animation first shows the unbalanced tree, then the rotations.
+    """
+    def _height(self, entry):
+        return entry.height if entry is not None else 0
+
+    def _fix_height(self, entry):
+        if entry is not None:
+            entry.height = 1 + max(self._height(entry.left), self._height(entry.right))
+
+    def _fix_rotated(self, pivot):
+        """Heights after a rotation: the demoted node first, then the pivot."""
+        self._fix_height(pivot.left)
+        self._fix_height(pivot.right)
+        self._fix_height(pivot)
+
+    def _fix_heights_up(self, entry):
+        """Recomputes heights from `entry` up to the root."""
+        while entry is not None:
+            self._fix_height(entry)
+            entry = entry.parent
+
+    def rotate_left(self, value):
+        """Rotates left like BinaryTree (no rebalancing), keeping heights right."""
+        animation = super().rotate_left(value)
+        # the rotated node is now below its pivot, so this covers both
+        self._fix_heights_up(self.find_entry(value))
+        return animation
+
+    def rotate_right(self, value):
+        """Rotates right like BinaryTree (no rebalancing), keeping heights right."""
+        animation = super().rotate_right(value)
+        self._fix_heights_up(self.find_entry(value))
+        return animation
+
+    def _rebalance(self, entry):
+        """Walks up from `entry`, fixing heights and rotating. Returns True if rotated."""
+        rotated = False
+        while entry is not None:
+            self._fix_height(entry)
+            balance = self._height(entry.left) - self._height(entry.right)
+            if balance > 1:
+                if self._height(entry.left.left) < self._height(entry.left.right):
+                    self._fix_rotated(self._rotate_left(entry.left))
+                entry = self._rotate_right(entry)
+                self._fix_rotated(entry)
+                rotated = True
+            elif balance < -1:
+                if self._height(entry.right.right) < self._height(entry.right.left):
+                    self._fix_rotated(self._rotate_right(entry.right))
+                entry = self._rotate_left(entry)
+                self._fix_rotated(entry)
+                rotated = True
+            entry = entry.parent
+        return rotated
+
+    def _insert_entry(self, value):
+        entry = super()._insert_entry(value)
+        self._rebalance(entry.parent)
+        return entry
+
+    def insert(self, value):
+        """Inserts `value`, then rebalances; returns the animation."""
+        self._flush_discarded()
+        entry = BST._insert_entry(self, value)
+        insert_anim = self._relayout([entry])
+        if not self._rebalance(entry.parent):
+            return insert_anim
+        return Succession(insert_anim, self._relayout())
+
+    def delete(self, value):
+        """Deletes `value`, then rebalances; returns the animation."""
+        entry = self.find_entry(value)
+        if entry is None:
+            print(f"Error: Value '{value}' not found.")
+            return FadeIn(Square().set_opacity(0))
+
+        self._flush_discarded()
+        lowest = self._delete_entry(entry)
+        delete_anim = AnimationGroup(*self._discard(entry), self._relayout())
+        if not self._rebalance(lowest):
+            return delete_anim
+        return Succession(delete_anim, self._relayout())
+
+class BinaryHeap(BinaryTree):
+    """
+    A binary heap Mobject (min-heap by default). push() and pop() return
+    a Succession: the structural change followed by each sift swap.
+    """
+    def __init__(self, values=(), min_heap=True, **kwargs):
+        super().__init__(**kwargs)
+        self.min_heap = min_heap
+        self.heap = [] # entries in level order
+
+        new_entries = []
+        for value in values:
+            new_entries.append(self._append_entry(value))
+            self._sift_up(len(self.heap) - 1, animate=False)
+        self._relayout(new_entries, animate=False)
+
+    def _before(self, a, b):
+        """True if value a belongs above value b."""
+        return a < b if self.min_heap else a > b
+
+    def _append_entry(self, value):
+        entry = self._new_entry(value)
+        index = len(self.heap)
+        self.heap.append(entry)
+        if index == 0:
+            self._set_child(None, None, entry)
+        else:
+            parent = self.heap[(index - 1) // 2]
+            self._set_child(parent, "left" if index % 2 == 1 else "right", entry)
+        return entry
+
+    def _swap(self, i, j, animate=True):
+        """Swaps the values (and their mobjects) of two slots."""
+        a, b = self.heap[i], self.heap[j]
+        a.value, b.value = b.value, a.value
+        a.mob, b.mob = b.mob, a.mob
+        if not animate:
+            return None # not laid out yet; _relayout places the mobjects
+        return AnimationGroup(
+            a.mob.animate.move_to(self._to_point(a.pos)),
+            b.mob.animate.move_to(self._to_point(b.pos))
+        )
+
+    def _sift_up(self, index, animate=True):
+        swaps = []
+        while index > 0:
+            parent = (index - 1) // 2
+            if not self._before(self.heap[index].value, self.heap[parent].value):
+                break
+            swaps.append(self._swap(index, parent, animate))
+            index = parent
+        return swaps
+
+    def _sift_down(self, index):
+        swaps = []
+        while True:
+            best = index
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(self.heap) and self._before(self.heap[child].value, self.heap[best].value):
+                    best = child
+            if best == index:
+                return swaps
+            swaps.append(self._swap(index, best))
+            index = best
+
+    def peek(self):
+        return self.heap[0].value if self.heap else None
+
+    def push(self, value):
+        """Appends `value`, sifts it up and returns the animation."""
+        self._flush_discarded()
+        entry = self._append_entry(value)
+        append_anim = self._relayout([entry])
+        return Succession(append_anim, *self._sift_up(len(self.heap) - 1))
+
+    def pop(self):
+        """Removes the top value, sifts down and returns the animation."""
+        if not self.heap:
+            print("Error: Heap is empty.")
+            return FadeIn(Square().set_opacity(0))
+
+        self._flush_discarded()
+        anims = []
+        last = len(self.heap) - 1
+        if last > 0:
+            anims.append(self._swap(0, last))
+        entry = self.heap.pop()
+        self._replace(entry, None)
+        anims.append(AnimationGroup(*self._discard(entry), self._relayout()))
+        anims.extend(self._sift_down(0))
+        return Succession(*anims)
+
+def _scatter_add(target, index, values):
+    """target[index] += values, summing repeated indices (like np.add.at, but faster)."""
+    for axis in range(target.shape[1]):
+        target[:, axis] += np.bincount(index, weights=values[:, axis], minlength=len(target))
+
+def _exact_repulsion(pos, k):
+    """All-pairs Fruchterman-Reingold repulsion, one (n, n) broadcast."""
+    delta = pos[:, None, :] - pos[None, :, :]
+    dist_sq = np.einsum("ijk,ijk->ij", delta, delta)
+    np.fill_diagonal(dist_sq, np.inf)
+    return np.einsum("ijk,ij->ik", delta, k * k / np.maximum(dist_sq, 1e-9))
+
+def _grid_repulsion(pos, k):
+    """
+    Repulsion using grid bucketing: only pairs in the same or neighbouring
+    cells of size 2k interact (the classic FR cutoff). Pairs are generated
+    with searchsorted/repeat over cells, so there are no Python loops over
+    nodes and the cost is O(n) for evenly spread graphs.
+    """
+    n = len(pos)
+    cell = 2 * k
+    cells = np.floor(pos / cell).astype(np.int64)
+    cells -= cells.min(axis=0) - 1 # keep neighbour cells >= 0
+    width = cells[:, 0].max() + 2
+    keys = cells[:, 1] * width + cells[:, 0]
+
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    disp = np.zeros_like(pos)
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            neighbour_keys = keys + dy * width + dx
+            start = np.searchsorted(sorted_keys, neighbour_keys, side="left")
+            counts = np.searchsorted(sorted_keys, neighbour_keys, side="right") - start
+            total = counts.sum()
+            if total == 0:
+                continue
+
+            # expand (node, neighbour cell) into one row per candidate pair
+            i = np.repeat(np.arange(n), counts)
+            run_start = np.repeat(np.cumsum(counts) - counts, counts)
+            j = order[np.repeat(start, counts) + np.arange(total) - run_start]
+
+            keep = i != j
+            i, j = i[keep], j[keep]
+            delta = pos[i] - pos[j]
+            dist_sq = np.maximum(np.einsum("ij,ij->i", delta, delta), 1e-9)
+            strength = np.where(dist_sq < cell * cell, k * k / dist_sq, 0.0)
+            _scatter_add(disp, i, delta * strength[:, None])
+    return disp
+
+def force_directed_layout(num_nodes, edges, iterations=100, seed=0, exact_limit=500):
+    """
+    Fruchterman-Reingold layout, vectorized with NumPy.
+    Returns an (num_nodes, 2) array of positions with natural edge length 1.
+    Graphs larger than `exact_limit` use grid-bucketed repulsion.
+    """
+    if num_nodes == 0:
+        return np.zeros((0, 2))
+
+    rng = np.random.default_rng(seed)
+    k = 1.0
+    side = np.sqrt(num_nodes) * k
+    pos = rng.uniform(-side / 2, side / 2, size=(num_nodes, 2))
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+
+    temperature = side / 10
+    cooling = temperature / (iterations + 1)
+    for _ in range(iterations):
+        if num_nodes <= exact_limit:
+            disp = _exact_repulsion(pos, k)
+        else:
+            disp = _grid_repulsion(pos, k)
+
+        if len(edges):
+            delta = pos[edges[:, 0]] - pos[edges[:, 1]]
+            dist = np.linalg.norm(delta, axis=1)[:, None]
+            pull = delta * dist / k
+            _scatter_add(disp, edges[:, 0], -pull)
+            _scatter_add(disp, edges[:, 1], pull)
+
+        # weak gravity keeps disconnected pieces from drifting apart
+        disp -= 0.05 * pos
+
+        length = np.maximum(np.linalg.norm(disp, axis=1), 1e-9)[:, None]
+        pos += disp / length * np.minimum(length, temperature)
+        temperature -= cooling
+    return pos
+
+_GRAPH_LAYOUT_CACHE = {} # topology key -> (n, 2) positions
+
+def cached_force_layout(num_nodes, edges, iterations=100, seed=0):
+    """
+    force_directed_layout(), cached by graph topology: in memory for this
+    render and as .npy files under media/graph_layouts for later renders.
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    digest = hashlib.sha256(f"{num_nodes}|{iterations}|{seed}|".encode())
+    digest.update(np.ascontiguousarray(edges).tobytes())
+    key = digest.hexdigest()[:16]
+
+    if key in _GRAPH_LAYOUT_CACHE:
+        return _GRAPH_LAYOUT_CACHE[key]
+
+    path = Path(config.get_dir("media_dir")) / "graph_layouts" / f"{key}.npy"
+    if path.exists():
+        positions = np.load(path)
+    else:
+        positions = force_directed_layout(num_nodes, edges, iterations=iterations, seed=seed)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(path, positions)
+
+    _GRAPH_LAYOUT_CACHE[key] = positions
+    return positions
+
+def _segments_to_points(starts, ends):
+    """Straight cubic bezier segments for many edges at once, as VMobject points."""
+    t = np.array([0, 1 / 3, 2 / 3, 1])[None, :, None]
+    return (starts[:, None, :] + t * (ends - starts)[:, None, :]).reshape(-1, 3)
+
+class DSAGraph(VGroup):
+    """
+    A data-driven Mobject for general graphs (system-design diagrams,
+    BFS / DFS, ...). Named DSAGraph so it doesn't shadow manim's own Graph.
+
+    The layout comes from a vectorized force-directed solver and is cached
+    by topology. All edges are drawn as ONE VMobject (one path per edge),
+    so thousands of edges cost a single mobject per frame.
+    """
+    def __init__(self, vertices, edges, node_color=BLUE, node_radius=0.08,
+                 edge_color=GRAY, edge_width=1, width=6.0, height=6.0,
+                 labels=False, directed=False, layout_iterations=100, seed=0, **kwargs):
+        super().__init__(**kwargs)
+        self.vertices = list(vertices)
+        self.index = {vertex: i for i, vertex in enumerate(self.vertices)}
+        self.edges = [(u, v) for u, v in edges]
+        self.node_color = node_color
+        self.edge_width = edge_width
+
+        # adjacency lists for traversals
+        self.adjacency = {vertex: [] for vertex in self.vertices}
+        for u, v in self.edges:
+            self.adjacency[u].append(v)
+            if not directed:
+                self.adjacency[v].append(u)
+
+        ### 1. Layout (cached by topology) ###
+        edge_index = np.array([(self.index[u], self.index[v]) for u, v in self.edges], dtype=np.int64)
+        layout = cached_force_layout(len(self.vertices), edge_index, layout_iterations, seed)
+
+        # fit into width x height, keeping the aspect ratio
+        positions = np.zeros((len(self.vertices), 3))
+        if len(self.vertices):
+            positions[:, :2] = layout - (layout.min(axis=0) + layout.max(axis=0)) / 2
+            extent = np.maximum(np.ptp(layout, axis=0), 1e-9)
+            positions[:, :2] *= min(width / extent[0], height / extent[1])
+        self.positions = positions
+
+        ### 2. Batched edges ###
+        self.edges_mob = VMobject(stroke_color=edge_color, stroke_width=edge_width)
+        if len(edge_index):
+            self.edges_mob.set_points(
+                _segments_to_points(positions[edge_index[:, 0]], positions[edge_index[:, 1]])
+            )
+
+        ### 3. Nodes ###
+        self.nodes = [Dot(point, radius=node_radius, color=node_color) for point in positions]
+        self.nodes_group = VGroup(*self.nodes)
+        self.labels = VGroup()
+        if labels:
+            for vertex, node in zip(self.vertices, self.nodes):
+                self.labels.add(Text(str(vertex), font_size=16).next_to(node, UP, buff=0.05))
+
+        # traversal trees are drawn between the edges and the nodes
+        self.traversal_group = VGroup()
+        self.add(self.edges_mob, self.traversal_group, self.nodes_group, self.labels)
+
+    def get_node(self, vertex):
+        return self.nodes[self.index[vertex]]
+
+    ### Traversals ###
+
+    def bfs_levels(self, start):
+        """BFS frontiers as a list of vertex lists, plus the BFS-tree parents."""
+        parents = {start: None}
+        levels = [[start]]
+        while levels[-1]:
+            frontier = []
+            for u in levels[-1]:
+                for v in self.adjacency[u]:
+                    if v not in parents:
+                        parents[v] = u
+                        frontier.append(v)
+            levels.append(frontier)
+        return levels[:-1], parents
+
+    def dfs_order(self, start):
+        """Iterative DFS discovery order, plus the DFS-tree parents."""
+        parents = {}
+        order = []
+        stack = [(start, None)]
+        while stack:
+            u, parent = stack.pop()
+            if u in parents:
+                continue
+            parents[u] = parent
+            order.append(u)
+            for v in reversed(self.adjacency[u]):
+                if v not in parents:
+                    stack.append((v, u))
+        return order, parents
+
+    def _traversal_animation(self, steps, parents, frontier_color, visited_color, step_time):
+        """
+        One animation per step: the new frontier lights up, its tree edges
+        fade in as a single batched VMobject, and the previous frontier
+        settles to visited_color.
+        """
+        anims = []
+        previous = []
+        for step in steps:
+            tree_edges = [(parents[v], v) for v in step if parents[v] is not None]
+            step_anims = [self.get_node(v).animate.set_color(frontier_color) for v in step]
+            step_anims += [self.get_node(v).animate.set_color(visited_color) for v in previous]
+            if tree_edges:
+                starts = self.positions[[self.index[u] for u, _ in tree_edges]]
+                ends = self.positions[[self.index[v] for _, v in tree_edges]]
+                edges_mob = VMobject(stroke_color=frontier_color, stroke_width=self.edge_width * 3)
+                edges_mob.set_points(_segments_to_points(starts, ends))
+                # hidden until its step plays (it's part of the graph already)
+                edges_mob.set_stroke(opacity=0)
+                self.traversal_group.add(edges_mob)
+                step_anims.append(edges_mob.animate.set_stroke(opacity=1))
+            anims.append(AnimationGroup(*step_anims, run_time=step_time))
+            previous = step
+
+        if previous:
+            anims.append(AnimationGroup(
+                *[self.get_node(v).animate.set_color(visited_color) for v in previous],
+                run_time=step_time
+            ))
+        return Succession(*anims)
+
+    def bfs(self, start, frontier_color=YELLOW, visited_color=GREEN, step_time=0.3):
+        """Returns an animation of the BFS frontier expanding level by level."""
+        if start not in self.index:
+            print(f"Error: Vertex '{start}' not found.")
+            return FadeIn(Square().set_opacity(0))
+        levels, parents = self.bfs_levels(start)
+        return self._traversal_animation(levels, parents, frontier_color, visited_color, step_time)
+
+    def dfs(self, start, frontier_color=YELLOW, visited_color=GREEN, step_time=0.3, batch_size=None):
+        """
+        Returns an animation of DFS discovery. Vertices are revealed in
+        batches of `batch_size` (default: ~30 steps for the whole graph).
+        """
+        if start not in self.index:
+            print(f"Error: Vertex '{start}' not found.")
+            return FadeIn(Square().set_opacity(0))
+        order, parents = self.dfs_order(start)
+        if batch_size is None:
+            batch_size = max(1, len(order) // 30)
+        steps = [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+        return self._traversal_animation(steps, parents, frontier_color, visited_color, step_time)
+
+    def clear_traversal(self):
+        """Instantly resets node colours and removes drawn traversal trees."""
+        for node in self.nodes:
+            node.set_color(self.node_color)
+        self.traversal_group.remove(*self.traversal_group.submobjects)
+
+_HIGHLIGHT_CACHE = {} # (source hash, language, style) -> list of Pango markup lines
+
+def highlighted_markup_lines(code_string, language=None, formatter_style="emacs", file_name=None):
+    """
+    Highlights the whole source ONCE with pygments and returns one Pango
+    markup string per line. Lexing the full file (rather than a window of
+    it) keeps multi-line strings and comments coloured correctly.
+    """
+    key = (hashlib.sha256(code_string.encode()).hexdigest(), language, formatter_style)
+    if key in _HIGHLIGHT_CACHE:
+        return _HIGHLIGHT_CACHE[key]
+
+    if language is not None:
+        lexer = get_lexer_by_name(language.lower())
+    elif file_name is not None:
+        lexer = guess_lexer_for_filename(str(file_name), code_string)
+    else:
+        lexer = guess_lexer(code_string)
+    style = get_style_by_name(formatter_style)
+
+    lines = [[]]
+    for token_type, value in lexer.get_tokens(code_string):
+        color = style.style_for_token(token_type)["color"]
+        for i, part in enumerate(value.split("\n")):
+            if i > 0:
+                lines.append([])
+            if part:
+                part = html.escape(part, quote=False)
+                lines[-1].append(f'<span foreground="#{color}">{part}</span>' if color else part)
+    # pygments always ends the token stream with a newline
+    if len(lines) > 1 and not lines[-1]:
+        lines.pop()
+
+    markup = ["".join(parts) for parts in lines]
+    _HIGHLIGHT_CACHE[key] = markup
+    return markup
+
+class ScrollingCode(VGroup):
+    """
+    A virtualized code listing for long source files.
+
+    The file is highlighted once, but line mobjects are only built for the
+    visible window. scroll_to() returns an animation that slides the window,
+    building just the lines that scroll in; lines that scroll out are
+    released with release_hidden_lines().
+    """
+    STRUT = "|" # full-height glyph that pins each line's baseline and left edge
+    _font_metrics = {} # (font, font_size) -> (advance, strut_height)
+
+    def __init__(self, code_file_path, visible_lines=20, language=None,
+                 formatter_style="emacs", tab_width=4, font="Noto Sans Mono",
+                 font_size=20, line_spacing=1.3, background_config=None, **kwargs):
+        super().__init__(**kwargs)
+        code_string = Path(code_file_path).read_text(encoding="utf-8").expandtabs(tab_width)
+        source_lines = code_string.split("\n")
+        self.markup_lines = highlighted_markup_lines(code_string, language, formatter_style, code_file_path)
+        self.num_lines = len(self.markup_lines)
+        self.visible_lines = max(1, min(visible_lines, self.num_lines))
+        self.font = font
+        self.font_size = font_size
+        self.gutter_digits = len(str(self.num_lines))
+        self.padding = 0.2
+
+        advance, self.strut_height = self._measure_font(font, font_size)
+        self.line_height = self.strut_height * line_spacing
+
+        ### 1. Background sized from character counts (no text built) ###
+        max_chars = max(len(line) for line in source_lines) + self.gutter_digits + 2
+        self.base_width = max_chars * advance + 2 * self.padding
+        background_style = {"fill_color": BLACK, "fill_opacity": 1.0, "stroke_color": WHITE}
+        background_style.update(background_config or {})
+        self.background = Rectangle(
+            width=self.base_width,
+            height=self.visible_lines * self.line_height + 2 * self.padding,
+            **background_style
+        )
+
+        ### 2. Only the visible lines ###
+        self.first_line = 0
+        self.line_mobs = {} # line index -> mobject, visible window only
+        self._released = [] # scrolled-out lines, removed after the scroll plays
+        self.lines_group = VGroup()
+        self.add(self.background, self.lines_group)
+        for index in range(self.visible_lines):
+            self.line_mobs[index] = self._make_line(index, self.first_line)
+            self.lines_group.add(self.line_mobs[index])
+
+    @classmethod
+    def _measure_font(cls, font, font_size):
+        """Character advance and line height of a monospace font, measured once."""
+        key = (font, font_size)
+        if key not in cls._font_metrics:
+            short = MarkupText(cls.STRUT + "M" * 10, font=font, font_size=font_size)
+            wide = MarkupText(cls.STRUT + "M" * 20, font=font, font_size=font_size)
+            cls._font_metrics[key] = ((wide.width - short.width) / 10, short[0].height)
+        return cls._font_metrics[key]
+
+    def _frame(self):
+        """(top-left corner, unit) of the listing, so moving / scaling it just works."""
+        return self.background.get_corner(UL), self.background.width / self.base_width
+
+    def get_line_y(self, index, first_line=None):
+        """Y coordinate of a line's centre, for the current (or a given) window."""
+        if first_line is None:
+            first_line = self.first_line
+        corner, unit = self._frame()
+        return corner[1] - unit * (self.padding + (index - first_line + 0.5) * self.line_height)
+
+    def get_line_height(self):
+        _, unit = self._frame()
+        return self.strut_height * unit
+
+    def _make_line(self, index, first_line):
+        """Builds the mobject for one line (gutter + highlighted code)."""
+        corner, unit = self._frame()
+        gutter = f'<span foreground="#888888">{index + 1:>{self.gutter_digits}}</span>  '
+        line = MarkupText(self.STRUT + gutter + self.markup_lines[index],
+                          font=self.font, font_size=self.font_size).scale(unit)
+
+        # pin the strut to the line slot, then drop it
+        strut = line[0]
+        target = np.array([corner[0] + unit * self.padding, self.get_line_y(index, first_line), 0])
+        line.shift(target - np.array([strut.get_left()[0], strut.get_center()[1], 0]))
+        line.remove(strut)
+        return line
+
+    def is_line_visible(self, index):
+        return self.first_line <= index < self.first_line + self.visible_lines
+
+    def scroll_to(self, index):
+        """
+        Scrolls just enough to show line `index` and returns the animation
+        (None if it is already visible).
+        """
+        self.release_hidden_lines()
+        if self.is_line_visible(index):
+            return None
+
+        if index < self.first_line:
+            new_first = index
+        else:
+            new_first = index - self.visible_lines + 1
+        new_first = max(0, min(new_first, self.num_lines - self.visible_lines))
+        delta = new_first - self.first_line
+        new_window = range(new_first, new_first + self.visible_lines)
+
+        # Far jumps cross-fade in place instead of sliding a whole screen
+        _, unit = self._frame()
+        shift_y = delta * self.line_height * unit
+        if abs(delta) >= self.visible_lines:
+            shift_y = 0
+
+        # Lines scrolling out / in never leave the background: they only
+        # slide as far as the first / last row and fade there
+        top_y = self.get_line_y(0, 0)
+        bottom_y = self.get_line_y(self.visible_lines - 1, 0)
+
+        def clamp(y):
+            return min(max(y, bottom_y), top_y)
+
+        anims = []
+        for line_index, mob in list(self.line_mobs.items()):
+            if line_index in new_window:
+                anims.append(mob.animate.shift(UP * shift_y))
+            else:
+                y = self.get_line_y(line_index)
+                anims.append(mob.animate.shift(UP * (clamp(y + shift_y) - y)).set_opacity(0))
+                self._released.append(mob)
+                del self.line_mobs[line_index]
+
+        for line_index in new_window:
+            if line_index not in self.line_mobs:
+                mob = self._make_line(line_index, new_first)
+                y = self.get_line_y(line_index, new_first)
+                offset = UP * (clamp(y - shift_y) - y)
+                mob.shift(offset).set_opacity(0)
+                self.lines_group.add(mob)
+                self.line_mobs[line_index] = mob
+                anims.append(mob.animate.shift(-offset).set_opacity(1))
+
+        self.first_line = new_first
+        return AnimationGroup(*anims)
+
+    def release_hidden_lines(self):
+        """Drops the mobjects of lines that have scrolled out of the window."""
+        self.lines_group.remove(*self._released)
+        self._released = []
+
+# A 480p15 review copy, to render alongside the 1080p60 master
+PREVIEW_OUTPUT = ("preview", 480, 15)
+
+class _ExtraOutput:
+    """One extra video written alongside the main render (see MultiResolutionWriter)."""
+    def __init__(self, name, pixel_height, frame_rate):
+        self.name = name
+        self.pixel_height = pixel_height
+        # keep the main aspect ratio; libx264 wants even dimensions
+        self.pixel_width = int(round(pixel_height * config.pixel_width / config.pixel_height / 2)) * 2
+        self.frame_rate = frame_rate
+        self.container = None
+        self.stream = None
+        self.frame_index = 0
+
+class MultiResolutionWriter:
+    """
+    Writes extra, smaller videos (e.g. a 480p15 review copy) from the SAME
+    frame stream as the main render, so construct() and every frame only
+    run once. Hooks into the scene's SceneFileWriter: each frame the main
+    render writes is decimated to the output's frame rate, downscaled and
+    encoded into a per-play partial file in a directory next to manim's
+    own partial movies, and the partials are concatenated when the render
+    finishes.
+
+    Decimation keeps its phase across plays, so a fresh render's preview
+    is as long as the master to within one output frame. A partial reused
+    from an earlier render keeps the phase it was written with, which can
+    shift the preview by up to one output frame per reused play.
+    """
+    def __init__(self, file_writer, outputs):
+        self.file_writer = file_writer
+        self.outputs = [_ExtraOutput(*output) for output in outputs]
+        self.current_hash = None
+        self.writing = False
+
+        # Wrap the file writer's per-play hooks on this instance only
+        original_is_cached = file_writer.is_already_cached
+        original_add_partial = file_writer.add_partial_movie_file
+        original_begin = file_writer.begin_animation
+        original_end = file_writer.end_animation
+        original_write_frame = file_writer.write_frame
+        original_finish = file_writer.finish
+
+        def is_already_cached(hash_invocation):
+            # a play only counts as cached if every extra output has it too
+            return original_is_cached(hash_invocation) and all(
+                self.partial_path(output, hash_invocation).exists() for output in self.outputs
+            )
+
+        def add_partial_movie_file(hash_animation):
+            original_add_partial(hash_animation)
+            self.current_hash = hash_animation
+
+        def begin_animation(allow_write=False, *args, **kwargs):
+            original_begin(allow_write, *args, **kwargs)
+            if allow_write and self.current_hash is not None and config.write_to_movie:
+                self.open_partials()
+
+        def write_frame(frame_or_renderer, num_frames=1):
+            original_write_frame(frame_or_renderer, num_frames)
+            if self.writing:
+                frame = frame_or_renderer
+                if not isinstance(frame, np.ndarray): # OpenGL renderer
+                    frame = frame_or_renderer.get_frame()
+                self.encode_frame(frame, num_frames)
+
+        def end_animation(allow_write=False, *args, **kwargs):
+            original_end(allow_write, *args, **kwargs)
+            if self.writing:
+                self.close_partials()
+
+        def finish(*args, **kwargs):
+            original_finish(*args, **kwargs)
+            if config.write_to_movie:
+                self.combine_outputs()
+                self.evict_partials()
+
+        file_writer.is_already_cached = is_already_cached
+        file_writer.add_partial_movie_file = add_partial_movie_file
+        file_writer.begin_animation = begin_animation
+        file_writer.write_frame = write_frame
+        file_writer.end_animation = end_animation
+        file_writer.finish = finish
+
+    def partial_directory(self, output):
+        """Sibling of manim's partial movie directory, e.g. .../MyScene_preview."""
+        directory = Path(self.file_writer.partial_movie_directory)
+        return directory.with_name(f"{directory.name}_{output.name}")
+
+    def partial_path(self, output, hash_animation):
+        return self.partial_directory(output) / f"{hash_animation}.mp4"
+
+    def open_partials(self):
+        for output in self.outputs:
+            path = self.partial_path(output, self.current_hash)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            output.container = av.open(str(path), mode="w")
+            output.stream = output.container.add_stream("libx264", rate=output.frame_rate)
+            output.stream.width = output.pixel_width
+            output.stream.height = output.pixel_height
+            output.stream.pix_fmt = "yuv420p"
+            output.stream.options = {"crf": "23"}
+        self.writing = True
+
+    def encode_frame(self, frame, num_frames):
+        for output in self.outputs:
+            # Decimation: keep a main frame whenever it starts a new output
+            # frame. frame_index runs over the whole render, not per play,
+            # so short plays don't each round up to a whole output frame.
+            keep = 0
+            for _ in range(num_frames):
+                index = output.frame_index
+                output.frame_index += 1
+                if index == 0 or (index * output.frame_rate) // config.frame_rate \
+                        != ((index - 1) * output.frame_rate) // config.frame_rate:
+                    keep += 1
+
+            for _ in range(keep):
+                # av frames can't be re-encoded, so build one per output frame
+                av_frame = av.VideoFrame.from_ndarray(frame, format="rgba").reformat(
+                    width=output.pixel_width, height=output.pixel_height, format="yuv420p"
+                )
+                for packet in output.stream.encode(av_frame):
+                    output.container.mux(packet)
+
+    def close_partials(self):
+        for output in self.outputs:
+            for packet in output.stream.encode(None): # flush the encoder
+                output.container.mux(packet)
+            output.container.close()
+            output.container, output.stream = None, None
+        self.writing = False
+
+    def combine_outputs(self):
+        """Concatenates each output's partial movies into <scene>_<name>.mp4."""
+        hashes = [
+            Path(movie_file).stem
+            for section in self.file_writer.sections
+            for movie_file in section.partial_movie_files
+            if movie_file is not None
+        ]
+        movie_path = Path(self.file_writer.movie_file_path)
+
+        for output in self.outputs:
+            partials = [self.partial_path(output, hash_animation) for hash_animation in hashes]
+            missing = [path for path in partials if not path.exists()]
+            if not partials or missing:
+                logger.warning(f"Skipping '{output.name}' output: {len(missing)} partial movies are missing.")
+                continue
+
+            list_file = partials[0].parent / "partial_movie_file_list.txt"
+            list_file.write_text("".join(f"file '{path.absolute().as_posix()}'\n" for path in partials))
+            output_path = movie_path.with_name(f"{movie_path.stem}_{output.name}.mp4")
+
+            # stream copy through the concat demuxer, like manim's own combine step
+            with av.open(str(list_file), options={"safe": "0"}, format="concat") as input_container, \
+                    av.open(str(output_path), mode="w") as output_container:
+                input_stream = input_container.streams.video[0]
+                if hasattr(output_container, "add_stream_from_template"):
+                    output_stream = output_container.add_stream_from_template(input_stream)
+                else:
+                    output_stream = output_container.add_stream(template=input_stream)
+                for packet in input_container.demux(input_stream):
+                    if packet.dts is None:
+                        continue
+                    packet.stream = output_stream
+                    output_container.mux(packet)
+
+            logger.info(f"'{output.name}' output ready at {output_path}")
+
+    def evict_partials(self):
+        """
+        Deletes extra-output partials whose main partial manim has removed
+        (--flush_cache, or clean_cache() once max_files_cached is exceeded).
+        """
+        main_directory = Path(self.file_writer.partial_movie_directory)
+        for output in self.outputs:
+            directory = self.partial_directory(output)
+            if not directory.is_dir():
+                continue
+            for path in directory.glob("*.mp4"):
+                if not (main_directory / f"{path.stem}{config.movie_file_extension}").exists():
+                    path.unlink()
+
+class PlayHashCache:
+    """
+    Remembers a fingerprint for every mobject on screen between play() calls.
+
+    Manim hashes the JSON of *every* mobject in the scene before each play
+    to find cached partial movie files. Our scenes keep the Code listing,
+    zones, log and lists on screen the whole time, so that cost grows with
+    the static content. Here a mobject is only re-serialized when an
+    animation touches it or when a cheap checksum of its raw arrays and
+    scalar attributes (joint / cap style, sheen, z_index, ...) says it
+    changed since the last play.
+
+    Note the checksum still reads every static array once per play, so
+    the per-play cost stays proportional to what's on screen; it is just
+    a much smaller constant than building and hashing the JSON.
+    """
+    # attribute values that are cheap to checksum as they are
+    SCALAR_TYPES = (bool, int, float, str, Enum, ManimColor, type(None))
+
+    def __init__(self):
+        self.fingerprints = {} # id(mobject) -> (mobject, state_key, fingerprint)
+        self.unchanged = set() # ids reused as-is by the last hash (untouched, same state)
+        self.hits = 0   # totals over the whole render
+        self.misses = 0
+
+    def state_key(self, mobject):
+        """
+        A checksum over the whole family (no JSON): every array attribute
+        (points, rgbas, pixel_array, sheen_direction, ...) byte for byte,
+        plus every scalar attribute by value.
+        """
+        crc = 0
+        for mob in mobject.get_family():
+            scalars = [type(mob).__name__, len(mob.submobjects)]
+            for name, value in vars(mob).items():
+                if isinstance(value, np.ndarray) and not value.dtype.hasobject:
+                    crc = zlib.crc32(name.encode(), crc)
+                    crc = zlib.crc32(np.ascontiguousarray(value).data, crc)
+                elif isinstance(value, self.SCALAR_TYPES):
+                    scalars.append((name, value))
+            crc = zlib.crc32(repr(scalars).encode(), crc)
+        return crc
+
+    def fingerprint(self, scene, mobject, touched):
+        """Returns (fingerprint, state_key), re-serializing only if needed."""
+        state = self.state_key(mobject)
+        cached = self.fingerprints.get(id(mobject))
+        if (id(mobject) not in touched and cached is not None
+                and cached[0] is mobject and cached[1] == state):
+            self.hits += 1
+            return cached[2], state
+
+        # Serialize on its own so the result doesn't depend on what else
+        # was memoized before it in this play call.
+        hashing._Memoizer.reset_already_processed()
+        hashing._Memoizer.mark_as_processed(scene)
+        value = zlib.crc32(repr(hashing.get_json(mobject)).encode())
+        self.misses += 1
+        return value, state
+
+    def hash_play_call(self, scene, camera, animations, mobjects):
+        """Drop-in replacement for manim's get_hash_from_play_call."""
+        t_start = perf_counter()
+        hashing._Memoizer.mark_as_processed(scene)
+        camera_json = hashing.get_json(camera)
+        animations_json = [
+            hashing.get_json(anim)
+            for anim in sorted(animations, key=lambda obj: str(obj))
+        ]
+
+        # Anything an animation moves, or that has updaters, is re-hashed
+        touched = set()
+        for anim in animations:
+            if anim.mobject is not None:
+                touched.update(id(mob) for mob in anim.mobject.get_family())
+        for mobject in mobjects:
+            if any(mob.updaters for mob in mobject.get_family()):
+                touched.add(id(mobject))
+
+        fingerprints = {}
+        mobject_values = []
+        unchanged = set()
+        for mobject in mobjects:
+            hits_before = self.hits
+            value, state = self.fingerprint(scene, mobject, touched)
+            if self.hits > hits_before:
+                unchanged.add(id(mobject))
+            fingerprints[id(mobject)] = (mobject, state, value)
+            mobject_values.append(value)
+        play_hits = len(unchanged)
+        self.unchanged = unchanged
+        # Only keep what's still on screen so removed mobjects can be freed
+        self.fingerprints = fingerprints
+        hashing._Memoizer.reset_already_processed()
+
+        hash_camera, hash_animations, hash_mobjects = (
+            zlib.crc32(repr(json_val).encode())
+            for json_val in [camera_json, animations_json, mobject_values]
+        )
+        logger.debug(
+            "Play hash computed in %(time)s ms (%(hits)s cached mobjects)",
+            {"time": str(1000 * (perf_counter() - t_start))[:5],
+             "hits": f"{play_hits}/{len(mobject_values)}"},
+        )
+        return f"{hash_camera}_{hash_animations}_{hash_mobjects}"
+
+_TEXT_CACHE = OrderedDict() # (text, font_size, color) -> Text, least recently used first
+_TEXT_CACHE_SIZE = 256
+
+def cached_text(text, font_size=15, color=WHITE):
+    """
+    Returns a fresh copy of a Text mobject, building (and rendering the
+    glyphs of) each distinct label only once. Copying is much cheaper than
+    a new Text, which goes through Pango and SVG parsing every time.
+    """
+    key = (text, font_size, str(color))
+    if key in _TEXT_CACHE:
+        _TEXT_CACHE.move_to_end(key)
+    else:
+        _TEXT_CACHE[key] = Text(text, font_size=font_size, color=color)
+        if len(_TEXT_CACHE) > _TEXT_CACHE_SIZE:
+            _TEXT_CACHE.popitem(last=False)
+    return _TEXT_CACHE[key].copy()
+
+class LogHistory:
+    """
+    The scrolling log inside Base_DSA_Scene's log_zone.
+
+    Recent messages live in a bounded ring buffer; only the lines that fit
+    in the zone have mobjects on screen. Messages are queued with push()
+    and scroll_animation() turns everything queued since the last call
+    into ONE animation, so a burst of messages costs a single scroll.
+    Only the messages that end up on screen are wrapped and built.
+    """
+    def __init__(self, log_zone, log_label, font_size=15, color=WHITE,
+                 history_size=100, line_spacing=1.5):
+        self.font_size = font_size
+        self.color = color
+        self.history = deque(maxlen=history_size) # every recent message, as strings
+        self.pending = []     # messages pushed but not yet animated in
+        self.visible = deque() # line mobjects on screen, oldest first
+
+        # rows start next to the "Log:" label and go down to the zone's bottom
+        self.left_x = log_label.get_right()[0] + 0.2
+        self.top_y = log_label.get_center()[1]
+        self.line_height = cached_text("Ag", font_size, color).height * line_spacing
+        bottom_y = log_zone.get_bottom()[1] + 0.1
+        self.capacity = max(1, int((self.top_y - bottom_y - self.line_height / 2) // self.line_height) + 1)
+        self.max_width = log_zone.get_right()[0] - 0.2 - self.left_x
+
+    def wrap(self, message):
+        """Splits a message into lines that fit the zone's width."""
+        text = cached_text(message, self.font_size, self.color)
+        if text.width <= self.max_width:
+            return [message]
+        chars_per_line = max(1, int(len(message) * self.max_width / text.width))
+        return textwrap.wrap(message, chars_per_line) or [message]
+
+    def push(self, message):
+        self.history.append(message)
+        self.pending.append(message)
+        # every message takes at least one row, so older ones can't survive
+        del self.pending[:-self.capacity]
+
+    def _slot(self, row):
+        return np.array([self.left_x, self.top_y - row * self.line_height, 0])
+
+    def scroll_animation(self, run_time=0.3):
+        """
+        One animation for everything pushed since the last call: old lines
+        scroll up (the top ones fade out) and the new lines fade in below.
+        Returns None if nothing is pending.
+        """
+        if not self.pending:
+            return None
+        # wrap newest first and stop once the zone is full, so messages
+        # that would scroll out within the same burst are never measured
+        lines = []
+        for message in reversed(self.pending):
+            lines[:0] = self.wrap(message)
+            if len(lines) >= self.capacity:
+                break
+        new_lines = [cached_text(line, self.font_size, self.color) for line in lines[-self.capacity:]]
+        self.pending = []
+
+        overflow = max(0, len(self.visible) + len(new_lines) - self.capacity)
+        shift = UP * overflow * self.line_height
+        anims = []
+        # lines scrolling out only rise as far as the top row, so they
+        # never fade over whatever sits above the log zone
+        for row in range(overflow):
+            anims.append(FadeOut(self.visible.popleft(), shift=UP * row * self.line_height))
+        if overflow:
+            anims += [mob.animate.shift(shift) for mob in self.visible]
+
+        for mob in new_lines:
+            mob.move_to(self._slot(len(self.visible)), aligned_edge=LEFT)
+            self.visible.append(mob)
+            anims.append(FadeIn(mob, shift=UP * 0.2))
+        return AnimationGroup(*anims, run_time=run_time)
+
+    def newest(self):
+        return self.visible[-1] if self.visible else None
+
+class _CheckpointPickler(pickle.Pickler):
+    """
+    Pickler for scene checkpoints.
+
+    manim's Code keeps the parsed BeautifulSoup tree of its listing in
+    _code_html, which is only used while building the mobject and is
+    deeply nested enough to exceed the recursion limit for longer files,
+    so it's left out.
+
+    Mobjects share manim's constant arrays (e.g. Arrow.normal_vector is
+    OUT), and manim's play hashing memoizes arrays by identity. Those
+    constants are saved by name and loaded back as the very same objects,
+    so plays after a resume hash exactly like in a full render.
+    """
+    _constant_names = None # id(array) -> name in manim.constants
+
+    @classmethod
+    def constant_names(cls):
+        if cls._constant_names is None:
+            cls._constant_names = {
+                id(value): name for name, value in vars(manim_constants).items()
+                if isinstance(value, np.ndarray)
+            }
+        return cls._constant_names
+
+    def persistent_id(self, obj):
+        if isinstance(obj, np.ndarray):
+            return self.constant_names().get(id(obj))
+        return None
+
+    def reducer_override(self, obj):
+        if isinstance(obj, Code):
+            state = {k: v for k, v in obj.__dict__.items() if k != "_code_html"}
+            return copyreg.__newobj__, (type(obj),), state
+        return NotImplemented
+
+class _CheckpointUnpickler(pickle.Unpickler):
+    """Loads what _CheckpointPickler wrote, restoring shared manim constants."""
+    def persistent_load(self, name):
+        return getattr(manim_constants, name)
+
 class Base_DSA_Scene(Scene):
     """
     Our "stage": A base scene that automatically sets up
     a code window on the right and an animation zone on the left.
     """
-    
-    def setup_layout(self, code_file_path):
+    # Set to False to fall back to manim's own (full) per-play hashing
+    use_hash_cache = True
+    # Set to False to keep invisible / off-frame mobjects in the render list
+    prune_invisible = True
+    # Snapshot the scene to disk after every act run through run_acts()
+    checkpoint_acts = True
+    # Act (method name) to resume after; None means the latest valid snapshot
+    resume_act = None
+    # Extra (name, pixel_height, frame_rate) videos written from the same
+    # frames as the main render, e.g. [PREVIEW_OUTPUT] next to a -qh render
+    extra_outputs = []
+    # Longer code files get a virtualized ScrollingCode listing this tall
+    max_static_listing_lines = 20
+    # Per-play bookkeeping Scene.play sets on the instance; never checkpointed
+    PLAY_ATTRIBUTES = {"animations", "duration", "stop_condition", "moving_mobjects",
+                       "static_mobjects", "last_t", "time_progression"}
+
+    def __init__(self, *args, **kwargs):
+        self.hash_cache = PlayHashCache()
+        self.pruned_mobjects = [] # [mobject, index in self.mobjects, state_key] entries
+        self.pruning_stats = []   # (frames, skipped family members) per play
+        self.checkpoint_files = [] # extra files (code listings) acts depend on
+        self.log_history = None    # LogHistory, created by setup_layout
+        self._log_deferred = False
+        super().__init__(*args, **kwargs)
+        self.multi_writer = None
+        if self.extra_outputs and config.write_to_movie:
+            self.multi_writer = MultiResolutionWriter(self.renderer.file_writer, self.extra_outputs)
+        # Everything set after this point is "our" scene state (listing,
+        # log_text, lists, ...) and gets saved in checkpoints.
+        self._scene_attributes = set(self.__dict__) - {"pruned_mobjects", "checkpoint_files", "log_history"}
+
+    def play(self, *args, **kwargs):
+        """
+        Plays animations exactly like Scene.play, but lets the renderer
+        hash the scene through our PlayHashCache and keeps pruned
+        (invisible) mobjects out of the render list. Log lines queued
+        with update_log_text(defer=True) scroll in as part of this play.
+        """
+        animations = [prepare_animation(anim) for anim in args]
+        if self.log_history is not None and self.log_history.pending:
+            animations.append(self.log_history.scroll_animation())
+            self.log_text = self.log_history.newest()
+        if self.prune_invisible:
+            self.restore_pruned_mobjects(animations, kwargs.get("run_time"))
+
+        use_cache = self.use_hash_cache and hasattr(cairo_renderer, "get_hash_from_play_call")
+        # Stays empty if this play isn't hashed (e.g. --disable_caching)
+        self.hash_cache.unchanged = set()
+        if use_cache:
+            original_hash = cairo_renderer.get_hash_from_play_call
+            cairo_renderer.get_hash_from_play_call = self.hash_cache.hash_play_call
+        try:
+            super().play(*animations, **kwargs)
+        finally:
+            if use_cache:
+                cairo_renderer.get_hash_from_play_call = original_hash
+
+        if self.prune_invisible:
+            self.prune_invisible_mobjects()
+
+    def is_mobject_visible(self, mobject):
+        """
+        False if nothing in the mobject's family would leave a mark on the
+        frame: no points, fully transparent, or entirely off-frame.
+        """
+        family = [mob for mob in mobject.get_family() if mob.has_points()]
+        if not family:
+            return False
+
+        def draws_something(mob):
+            if not isinstance(mob, VMobject):
+                return True # images etc. are always considered visible
+            if np.any(mob.get_fill_opacities() > 0):
+                return True
+            return mob.get_stroke_width() > 0 and np.any(mob.get_stroke_opacities() > 0)
+
+        if not any(draws_something(mob) for mob in family):
+            return False
+
+        # Bounding box of the whole family against the camera frame
+        points = np.vstack([mob.points for mob in family])
+        frame_center = getattr(self.camera, "frame_center", ORIGIN)
+        half_w = getattr(self.camera, "frame_width", config.frame_width) / 2 + 0.5
+        half_h = getattr(self.camera, "frame_height", config.frame_height) / 2 + 0.5
+        mins = points.min(axis=0) - frame_center
+        maxs = points.max(axis=0) - frame_center
+        return not (maxs[0] < -half_w or mins[0] > half_w
+                    or maxs[1] < -half_h or mins[1] > half_h)
+
+    def prune_invisible_mobjects(self):
+        """
+        Detaches invisible top-level mobjects from self.mobjects so they
+        aren't rendered or hashed. Mobjects with updaters are never pruned.
+
+        Mobjects the play's hash found untouched and unchanged were visible
+        after the previous play and still are, so only the rest are checked.
+        """
+        unchanged = self.hash_cache.unchanged
+        kept = []
+        for index, mobject in enumerate(self.mobjects):
+            if (id(mobject) in unchanged
+                    or mobject in self.foreground_mobjects
+                    or any(mob.updaters for mob in mobject.get_family())
+                    or self.is_mobject_visible(mobject)):
+                kept.append(mobject)
+            else:
+                state = self.hash_cache.state_key(mobject)
+                self.pruned_mobjects.append([mobject, index, state])
+        self.mobjects = kept
+
+    def restore_pruned_mobjects(self, animations=(), run_time=None):
+        """
+        Re-attaches pruned mobjects that an animation is about to touch,
+        or that became visible again through a direct change. Visibility is
+        only re-checked when a mobject's state checksum changed.
+        """
+        animated = set()
+        for anim in animations:
+            if anim.mobject is not None:
+                animated.update(id(mob) for mob in anim.mobject.get_family())
+
+        still_pruned = []
+        # Re-insert in original order so the layering is preserved
+        for mobject, index, state in sorted(self.pruned_mobjects, key=lambda entry: entry[1]):
+            if any(id(mob) in animated for mob in mobject.get_family()):
+                self.mobjects.insert(min(index, len(self.mobjects)), mobject)
+                continue
+            new_state = self.hash_cache.state_key(mobject)
+            if new_state != state and self.is_mobject_visible(mobject):
+                self.mobjects.insert(min(index, len(self.mobjects)), mobject)
+            else:
+                still_pruned.append([mobject, index, new_state])
+        self.pruned_mobjects = still_pruned
+
+        # Record how much rendering this play gets to skip
+        skipped = sum(len(entry[0].get_family()) for entry in self.pruned_mobjects)
+        if run_time is None:
+            run_time = max([anim.get_run_time() for anim in animations], default=0)
+        self.pruning_stats.append((int(run_time * config.frame_rate), skipped))
+        logger.debug("Skipping %(skipped)s pruned mobjects per frame", {"skipped": skipped})
+
+    def forget_pruned(self, mobjects):
+        """Drops mobjects from the pruned list (explicitly added / removed)."""
+        ids = {id(mob) for mob in mobjects}
+        self.pruned_mobjects = [entry for entry in self.pruned_mobjects if id(entry[0]) not in ids]
+
+    def stage_mobjects(self):
+        """
+        Everything on stage: self.mobjects plus the pruned (invisible)
+        mobjects, which aren't in self.mobjects. Use this for loops like
+        "fade out everything".
+        """
+        return list(self.mobjects) + [entry[0] for entry in self.pruned_mobjects]
+
+    def clear(self):
+        self.pruned_mobjects = []
+        return super().clear()
+
+    def add(self, *mobjects):
+        self.forget_pruned(mobjects)
+        return super().add(*mobjects)
+
+    def remove(self, *mobjects):
+        self.forget_pruned(mobjects)
+        return super().remove(*mobjects)
+
+    def skipped_mobjects_per_frame(self):
+        """Average number of pruned mobjects skipped in each rendered frame."""
+        frames = sum(frames for frames, _ in self.pruning_stats)
+        if frames == 0:
+            return 0.0
+        return sum(frames * skipped for frames, skipped in self.pruning_stats) / frames
+
+    def tear_down(self):
+        super().tear_down()
+        if self.prune_invisible and self.pruning_stats:
+            logger.info(
+                "Pruning skipped %(avg).1f invisible mobjects per frame on average",
+                {"avg": self.skipped_mobjects_per_frame()},
+            )
+
+    ### Checkpoints ###
+
+    def run_acts(self, *acts):
+        """
+        Runs the given act methods in order and snapshots the scene after
+        each one. If a valid snapshot exists, every act up to it is skipped
+        and the render resumes from there, reusing the partial movie files
+        of the skipped acts.
+        """
+        keys = self.act_keys(acts)
+        start = 0
+        if self.checkpoint_acts and not config.disable_caching:
+            start = self.resume_from_checkpoint(acts, keys)
+
+        for index in range(start, len(acts)):
+            acts[index]()
+            if self.checkpoint_acts and not config.disable_caching:
+                self.save_checkpoint(index, acts[index].__name__, keys[index])
+
+    def act_keys(self, acts):
+        """
+        One key per act boundary: a hash of every module that defines a
+        class of this scene (scenes.py, manim_utils, ...), the render
+        quality and the source of every act up to (and including) it.
+        The acts are cut out of the module sources, so editing an act only
+        invalidates its snapshot and later ones; editing anything else in
+        those modules (class attributes, helpers, ...) invalidates them all.
+        """
+        act_sources = [inspect.getsource(act) for act in acts]
+
+        def without_acts(source):
+            for act_source in act_sources:
+                source = source.replace(act_source, "")
+            return source
+
+        digest = hashlib.sha256()
+        digest.update(type(self).__name__.encode())
+        for module_name in self.source_modules():
+            try:
+                digest.update(without_acts(inspect.getsource(sys.modules[module_name])).encode())
+            except (OSError, TypeError):
+                # no source file (e.g. an interactive session): fall back to the classes
+                for cls in type(self).__mro__:
+                    if cls.__module__ == module_name:
+                        digest.update(without_acts(inspect.getsource(cls)).encode())
+        digest.update(f"{config.pixel_width}x{config.pixel_height}@{config.frame_rate}".encode())
+
+        keys = []
+        for act_source in act_sources:
+            digest.update(act_source.encode())
+            keys.append(digest.copy().hexdigest())
+        return keys
+
+    def source_modules(self):
+        """Modules (outside manim itself) that define a class of this scene, in MRO order."""
+        modules = []
+        for cls in type(self).__mro__:
+            name = cls.__module__
+            if name in ("builtins", "manim") or name.startswith("manim."):
+                continue
+            if name not in modules:
+                modules.append(name)
+        return modules
+
+    def checkpoint_path(self, index, name):
+        directory = Path(config.get_dir("media_dir")) / "checkpoints" / type(self).__name__
+        return directory / f"{index:02d}_{name}.pkl"
+
+    def file_digests(self, paths):
+        """Content hashes of the given files (None if missing)."""
+        digests = {}
+        for path in paths:
+            try:
+                digests[str(path)] = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+            except OSError:
+                digests[str(path)] = None
+        return digests
+
+    def save_checkpoint(self, index, name, key):
+        """Pickles the scene state at the end of act `index` to disk."""
+        file_writer = self.renderer.file_writer
+        state = {
+            "key": key,
+            "files": self.file_digests(self.checkpoint_files),
+            "attributes": {k: v for k, v in self.__dict__.items()
+                           if k not in self._scene_attributes
+                           and k not in self.PLAY_ATTRIBUTES},
+            "mobjects": self.mobjects,
+            "pruned_mobjects": self.pruned_mobjects,
+            "foreground_mobjects": self.foreground_mobjects,
+            "time": self.renderer.time,
+            "num_plays": self.renderer.num_plays,
+            "sections": getattr(file_writer, "sections", None),
+        }
+
+        path = self.checkpoint_path(index, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with open(path, "wb") as file:
+                _CheckpointPickler(file, pickle.HIGHEST_PROTOCOL).dump(state)
+        except Exception as error:
+            # e.g. a mobject holding an updater lambda; a checkpoint is
+            # only an optimization, so it must never abort the render
+            logger.warning(f"Could not checkpoint act '{name}': {error!r}")
+            path.unlink(missing_ok=True)
+
+    def load_checkpoint(self, index, name, key):
+        """Returns the saved state if it is still valid, otherwise None."""
+        path = self.checkpoint_path(index, name)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "rb") as file:
+                state = _CheckpointUnpickler(file).load()
+        except Exception as error:
+            logger.warning(f"Ignoring unreadable checkpoint {path}: {error}")
+            return None
+
+        if state["key"] != key:
+            return None
+        if self.file_digests(state["files"]) != state["files"]:
+            return None
+
+        # The video of the skipped acts has to still be on disk
+        for section in state["sections"] or []:
+            for movie_file in section.partial_movie_files:
+                if movie_file is not None and not Path(movie_file).exists():
+                    return None
+        return state
+
+    def resume_from_checkpoint(self, acts, keys):
+        """
+        Restores the latest valid snapshot (or the one after `resume_act`)
+        and returns the index of the first act that still has to run.
+        """
+        names = [act.__name__ for act in acts]
+        last = len(acts) - 1
+        if self.resume_act is not None:
+            if self.resume_act not in names:
+                print(f"Error: Act '{self.resume_act}' not found.")
+                return 0
+            last = min(last, names.index(self.resume_act))
+
+        for index in range(last, -1, -1):
+            state = self.load_checkpoint(index, names[index], keys[index])
+            if state is None:
+                continue
+
+            self.__dict__.update(state["attributes"])
+            self.mobjects = state["mobjects"]
+            self.pruned_mobjects = state["pruned_mobjects"]
+            self.foreground_mobjects = state["foreground_mobjects"]
+            self.renderer.time = state["time"]
+            self.renderer.num_plays = state["num_plays"]
+            if state["sections"] is not None:
+                self.renderer.file_writer.sections = state["sections"]
+
+            logger.info(f"Resuming {type(self).__name__} after act '{names[index]}'")
+            return index + 1
+        return 0
+
+    def setup_layout(self, code_file_path, visible_lines=None):
         """
         Creates and positions self.listing (the code)
         and self.anim_zone (the animation area).
+        Files longer than max_static_listing_lines (or any file, if
+        visible_lines is given) get a scrolling listing.
         """
         
+        # A changed listing must invalidate later checkpoints
+        self.checkpoint_files.append(code_file_path)
+
         ### 1. Create and Position the Code ###
-        self.listing = Code(
-            code_file_path,
-            tab_width=4,
-            formatter_style="emacs",
-            background="rectangle",
-            language="Python",
-            background_config={
-                "fill_color": BLACK,
-                "fill_opacity": 1.0,
-                "stroke_color": WHITE
-            },
-            paragraph_config={"font": "Noto Sans Mono",
-                              "font_size": 20}
-        ).set_z_index(0)
+        background_config = {
+            "fill_color": BLACK,
+            "fill_opacity": 1.0,
+            "stroke_color": WHITE
+        }
+        num_lines = len(Path(code_file_path).read_text(encoding="utf-8").splitlines())
+        if visible_lines is None and num_lines > self.max_static_listing_lines:
+            visible_lines = self.max_static_listing_lines
+
+        if visible_lines is not None:
+            self.listing = ScrollingCode(
+                code_file_path,
+                visible_lines=visible_lines,
+                tab_width=4,
+                formatter_style="emacs",
+                language="Python",
+                background_config=background_config,
+                font="Noto Sans Mono",
+                font_size=20
+            ).set_z_index(0)
+        else:
+            self.listing = Code(
+                code_file_path,
+                tab_width=4,
+                formatter_style="emacs",
+                background="rectangle",
+                language="Python",
+                background_config=background_config,
+                paragraph_config={"font": "Noto Sans Mono",
+                                  "font_size": 20}
+            ).set_z_index(0)
         
         # Position code in the top-right corner
         self.listing.to_corner(UP + RIGHT, buff=0.25)
@@ -251,21 +2157,35 @@ class Base_DSA_Scene(Scene):
         self.log_text = Text("", font_size=18, color=WHITE)
         self.log_text.next_to(self.log_label, RIGHT, buff=0.2)
         self.add(self.log_text)
+
+        # The scrolling history behind update_log_text
+        self.log_history = LogHistory(self.log_zone, self.log_label, font_size=15, color=WHITE)
         # some new helper methods
 
     def highlight_line(self, line_num):
         """
         Animates our manual highlight rectangle to a specific line.
+        A ScrollingCode listing scrolls along if the line is off-screen.
         """
-        try:
-            # Access the Paragraph (index 1), then its submobjects (the lines)
-            target_line = self.listing[1].submobjects[line_num]
-        except IndexError:
-            print(f"Error: Line number {line_num} is out of bounds.")
-            return
-            
-        # 1. Get the target Y-coordinate from the line
-        target_y = target_line.get_center()[1]
+        scroll_animation = None
+        if isinstance(self.listing, ScrollingCode):
+            if not 0 <= line_num < self.listing.num_lines:
+                print(f"Error: Line number {line_num} is out of bounds.")
+                return
+            scroll_animation = self.listing.scroll_to(line_num)
+            target_y = self.listing.get_line_y(line_num)
+            line_height = self.listing.get_line_height()
+        else:
+            try:
+                # Access the Paragraph (index 1), then its submobjects (the lines)
+                target_line = self.listing[1].submobjects[line_num]
+            except IndexError:
+                print(f"Error: Line number {line_num} is out of bounds.")
+                return
+
+            # 1. Get the target Y-coordinate from the line
+            target_y = target_line.get_center()[1]
+            line_height = target_line.get_height()
         
         # 2. Create the new position using our stored X and the target Y
         target_position = [self.code_center_x, target_y, 0]
@@ -273,10 +2193,14 @@ class Base_DSA_Scene(Scene):
         # Create the animation
         animation = self.highlighter.animate\
             .move_to(target_position)\
-            .set_height(target_line.get_height() + 0.1)\
+            .set_height(line_height + 0.1)\
             .set_opacity(0.4)
         
-        self.play(animation, run_time=0.4)
+        if scroll_animation is not None:
+            self.play(animation, scroll_animation, run_time=0.4)
+            self.listing.release_hidden_lines()
+        else:
+            self.play(animation, run_time=0.4)
         self.current_highlighted_line = line_num
         self.wait(0.1) # Pause to read the line
 
@@ -285,30 +2209,44 @@ class Base_DSA_Scene(Scene):
         self.play(self.highlighter.animate.set_opacity(0), run_time=0.3)
         self.current_highlighted_line = None
         
-    def update_log_text(self, new_text_string):
-        """Helper to update the log text Mobject."""
-        new_text = Text(new_text_string, font_size=15, color=WHITE)
-        # We position it relative to the STATIC label, not the old text
-        new_text.next_to(self.log_label, RIGHT, buff=0.2) 
-        
-        # Animate the transformation
-        #self.play(Transform(self.log_text, new_text), run_time=0.5)
-        # We replace the single Transform line with a cross-fade
-        self.play(
-            FadeOut(self.log_text, shift=DOWN*0.2), # Fade out old, moving down
-            FadeIn(new_text, shift=DOWN*0.2),    # Fade in new, moving down
-            run_time=0.3 # Make it a bit faster
-        )
-        
-        # CRITICAL: We must now update the scene's reference
-        # to point to the new text Mobject.
-        self.remove(self.log_text) # Remove old text from scene
-        self.add(new_text)         # Add new text to scene
-        self.log_text = new_text   # Update the variable
+    def update_log_text(self, new_text_string, defer=False):
+        """
+        Helper to add a line to the scrolling log.
+        With defer=True (or inside log_burst()) the line is only queued and
+        scrolls in together with the next play, so bursts cost one scroll.
+        """
+        self.log_history.push(new_text_string)
+        if defer or self._log_deferred:
+            return
 
+        self.flush_log()
+        self.wait(0.5)
 
+    def flush_log(self):
+        """Plays one scroll animation for every queued log line (False if none)."""
+        animation = self.log_history.scroll_animation()
+        if animation is None:
+            return False
+        self.play(animation)
+        # keep pointing at the newest line, as before
+        self.log_text = self.log_history.newest()
+        return True
 
-        self.wait(0.5)
+    @contextmanager
+    def log_burst(self):
+        """
+        Coalesces every update_log_text() inside the block:
+            with self.log_burst():
+                for step in steps:
+                    self.update_log_text(step)
+        """
+        self._log_deferred = True
+        try:
+            yield
+        finally:
+            self._log_deferred = False
+            if self.flush_log():
+                self.wait(0.5)
 
         # In manim_utils.py
 
@@ -7,60 +7,78 @@ class IntroToLinkedListScene(Base_DSA_Scene):
     """
     Session 4: The final choreographed "Intro to Linked Lists" video.
     VERSION 2: Includes a "code swap" animation.
+    VERSION 3: Split into acts so re-renders resume from the last checkpoint.
     """
     def construct(self):
-        
+        self.run_acts(
+            self.act_setup,
+            self.act_what_is_a_node,
+            self.act_data,
+            self.act_next_pointer,
+            self.act_link_nodes,
+            self.act_code_swap,
+            self.act_head,
+            self.act_the_end,
+        )
+
+    def act_setup(self):
         ### 1. Setup ###
         self.setup_layout("./code_snippets/node_definition.py")
         self.play(Write(self.listing))
         self.wait(1) 
 
+    def act_what_is_a_node(self):
         ### 2. Act 1: "What is a Node?" ###
         self.update_log_text("A Node is a container.")
         self.highlight_line(0) # 'class Node:'
         
-        node1 = LinkedListNode("A")
-        node1.scale_to_fit_width(self.anim_zone.width * 0.2)
-        node1.move_to(self.anim_zone.get_center())
+        self.node1 = LinkedListNode("A")
+        self.node1.scale_to_fit_width(self.anim_zone.width * 0.2)
+        self.node1.move_to(self.anim_zone.get_center())
         
-        self.play(Create(node1))
+        self.play(Create(self.node1))
         self.wait(1)
         
+    def act_data(self):
         ### 3. Act 2: "It has data..." ###
         self.update_log_text("It stores a piece of data...")
         self.highlight_line(2) # 'self.data = data'
-        self.play(Indicate(node1.data_box))
+        self.play(Indicate(self.node1.data_box))
         self.wait(1)
 
+    def act_next_pointer(self):
         ### 4. Act 3: "...and a 'next' pointer." ###
         self.update_log_text("...and a pointer to the next node.")
         self.highlight_line(3) # 'self.next = None'
-        self.play(Indicate(node1.next_box))
+        self.play(Indicate(self.node1.next_box))
         self.wait(1)
 
+    def act_link_nodes(self):
         ### 5. Act 4: "Let's link them!" ###
         self.unhighlight_line()
         self.update_log_text("Multiple nodes are linked together.")
 
-        my_list = LinkedList(["A", "B", "C"])
-        my_list.scale_to_fit_width(self.anim_zone.width * 0.9)
-        my_list.move_to(self.anim_zone.get_center())
+        self.my_list = LinkedList(["A", "B", "C"])
+        self.my_list.scale_to_fit_width(self.anim_zone.width * 0.9)
+        self.my_list.move_to(self.anim_zone.get_center())
 
         self.play(
-            Transform(node1, my_list.get_node(0)),
-            FadeIn(my_list.get_node(1)),
-            FadeIn(my_list.get_node(2)),
-            FadeIn(my_list.arrows),
-            FadeIn(my_list.null_text)
+            Transform(self.node1, self.my_list.get_node(0)),
+            FadeIn(self.my_list.get_node(1)),
+            FadeIn(self.my_list.get_node(2)),
+            FadeIn(self.my_list.arrows),
+            FadeIn(self.my_list.null_text)
         )
         self.wait(1)
         
         # --- ( NEW CODE STARTS HERE ) ---
         
+    def act_code_swap(self):
         ### 6. Act 5: "Code Swap" ###
         self.update_log_text("A LinkedList class tracks the 'head'.")
 
         # Create the new code Mobject
+        self.checkpoint_files.append("./code_snippets/linked_list_class.py")
         new_listing = Code(
             "./code_snippets/linked_list_class.py",
             tab_width=4,
@@ -92,6 +110,7 @@ class IntroToLinkedListScene(Base_DSA_Scene):
         self.code_center_x = new_listing.get_center()[0]
         self.wait(1)
 
+    def act_head(self):
         ### 7. Act 6: "Animate the Head" ###
         self.update_log_text("The 'head' points to the start.")
         2
@@ -100,23 +119,25 @@ class IntroToLinkedListScene(Base_DSA_Scene):
         
         # Play the pointer creation simultaneously
         self.play(
-            my_list.create_pointer(0, label="head", p_color=YELLOW, direction=UP)
+            self.my_list.create_pointer(0, label="head", p_color=YELLOW, direction=UP)
         )
         self.wait(1)
         
         # --- ( NEW CODE ENDS HERE ) ---
 
+    def act_the_end(self):
         ### 8. Act 7: "The End" ###
         self.unhighlight_line()
         self.update_log_text("The last node points to None.")
-        self.play(Indicate(my_list.null_text)) # Flash the None
+        self.play(Indicate(self.my_list.null_text)) # Flash the None
 
         self.update_log_text("This is a Linked List.")
         self.wait(2)
         # This one line fades out all Mobjects currently on the scene,
         # including the list, code, log, highlighter, etc.
+        # (stage_mobjects() also includes the pruned, invisible ones)
         self.play(
-            *[FadeOut(mob) for mob in self.mobjects]
+            *[FadeOut(mob) for mob in self.stage_mobjects()]
         )
         self.wait(0.5) # A short pause after fading
         # end_message = Text("Thanks for watching!")
@@ -306,4 +327,120 @@ class TestLL(Scene):
 
         self.play(Transform(curr_ptr, new_curr_ptr), run_time = 2)
 
-        self.wait(2)
\ No newline at end of file
+        self.wait(2)
+
+
+class TestTreeScene(Scene):
+    """
+    A scene to test the BST / AVL / heap Mobjects
+    and their incremental layout.
+    """
+    def construct(self):
+
+        ### 1. BST insert / delete ###
+        self.add(Text("Test 1: BST insert & delete", font_size=24).to_corner(UL))
+        bst = BST([50, 30, 70])
+        bst.move_to(UP * 1.5)
+        self.play(Create(bst))
+
+        for value in [20, 40, 60, 80, 35]:
+            self.play(bst.insert(value))
+        self.play(bst.create_pointer(40, label="curr"))
+        self.play(bst.delete(30))
+        self.play(bst.search(35))
+        self.wait(1)
+        self.play(FadeOut(bst))
+
+        ### 2. AVL rotations ###
+        avl = AVLTree()
+        avl.move_to(UP * 1.5)
+        self.add(avl)
+        for value in [10, 20, 30, 40, 50, 25]:
+            self.play(avl.insert(value))
+        self.wait(1)
+        self.play(FadeOut(avl))
+
+        ### 3. Heap push / pop ###
+        heap = BinaryHeap([5, 3, 8])
+        heap.move_to(UP * 1.5)
+        self.play(Create(heap))
+        self.play(heap.push(1))
+        self.play(heap.pop())
+        self.wait(2)
+
+
+class TestGraphScene(Scene):
+    """
+    A scene to test the force-directed DSAGraph Mobject
+    on a small labelled graph and a large random one.
+    """
+    def construct(self):
+
+        ### 1. Small graph + BFS ###
+        self.add(Text("Test 1: BFS on a small graph", font_size=24).to_corner(UL))
+        edges = [("A", "B"), ("A", "C"), ("B", "D"), ("C", "D"), ("D", "E"), ("E", "F")]
+        graph = DSAGraph("ABCDEF", edges, node_radius=0.15, labels=True, width=5, height=5)
+        self.play(Create(graph))
+        self.play(graph.bfs("A"))
+        self.wait(1)
+        self.play(FadeOut(graph))
+
+        ### 2. Large graph + DFS ###
+        rng = random.Random(0)
+        vertices = list(range(2000))
+        edges = [(i, rng.randrange(i)) for i in range(1, 2000)]
+        big_graph = DSAGraph(vertices, edges, node_radius=0.03, width=7, height=7)
+        self.add(big_graph)
+        self.play(big_graph.dfs(0))
+        self.wait(2)
+
+
+class TestScrollingCodeScene(Base_DSA_Scene):
+    """
+    A scene to test the virtualized, auto-scrolling code listing
+    on a file longer than max_static_listing_lines.
+    """
+    def construct(self):
+
+        self.setup_layout("./code_snippets/linked_list_full.py", visible_lines=12)
+        self.play(Write(self.listing))
+
+        self.update_log_text("Test 1: Highlight inside the window")
+        self.highlight_line(3)
+
+        self.update_log_text("Test 2: Scroll down a few lines")
+        self.highlight_line(15)
+
+        self.update_log_text("Test 3: Jump far down (cross-fade)")
+        self.highlight_line(50)
+
+        self.update_log_text("Test 4: Scroll back up")
+        self.highlight_line(30)
+        self.unhighlight_line()
+        self.wait(2)
+
+
+class TestLogHistoryScene(Base_DSA_Scene):
+    """
+    A scene to test the scrolling log history
+    and coalescing bursts of log messages.
+    """
+    def construct(self):
+
+        self.setup_layout("./code_snippets/node_definition.py")
+        self.log_zone.set_stroke(RED, 2)
+        self.play(Write(self.listing), Create(self.log_zone))
+
+        ### 1. One message at a time ###
+        for i in range(3):
+            self.update_log_text(f"Test 1: message {i}")
+
+        ### 2. A burst becomes a single scroll ###
+        with self.log_burst():
+            for i in range(25):
+                self.update_log_text(f"Test 2: visiting node {i}")
+
+        ### 3. Deferred messages ride along with the next play ###
+        self.update_log_text("Test 3: highlighting line 2", defer=True)
+        self.highlight_line(2)
+        self.wait(2)